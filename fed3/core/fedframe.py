@@ -12,6 +12,7 @@ __pdoc__ = {'FEDFrame._load_init':True,
             'FEDFrame.ipi':False}
 
 from difflib import SequenceMatcher
+from functools import lru_cache
 import warnings
 
 import numpy as np
@@ -29,23 +30,47 @@ FIXED_COLS = ['Device_Number',
               'Pellet_Count',
               'Retrieval_Time',]
 
+FIXED_COLS_SET = frozenset(FIXED_COLS)
+
 NEEDED_COLS = ['Pellet_Count',
                'Left_Poke_Count',
                'Right_Poke_Count',]
 
 ZERO_DATE = pd.Timestamp(year=2000, month=1, day=1)
 
+EVENT_FLAGS = {'pellet': 1,
+               'left': 2,
+               'right': 4}
+'''Bit flags for the event codes of each row (see
+`FEDFrame._event_codes()`).  A row can carry more than one flag.'''
+
+@lru_cache(maxsize=None)
+def _match_fixed_column(col):
+    """Helper func for finding the first of `FIXED_COLS` which resembles
+    `col`, or None.  Cached, as the same headers recur across files."""
+    for fix in FIXED_COLS:
+        matcher = SequenceMatcher(a=col, b=fix)
+        # cheap upper bounds first, as used by difflib.get_close_matches
+        if (matcher.real_quick_ratio() > 0.85 and
+            matcher.quick_ratio() > 0.85 and
+            matcher.ratio() > 0.85):
+            return fix
+
+    return None
+
 def _filterout(series, dropna=False, dropzero=False, deduplicate=False):
     """Helper func for condensing series returned from FEDFrame methods."""
 
+    # one combined mask, so the series is only sliced once
+    keep = np.ones(len(series), dtype=bool)
     if dropna:
-        series = series.dropna()
+        keep &= series.notna().to_numpy()
     if dropzero:
-        series = series[series != 0]
+        keep &= (series != 0).to_numpy()
     if deduplicate:
-        series = series[~series.duplicated()]
+        keep &= ~series.duplicated().to_numpy()
 
-    return series
+    return series[keep]
 
 class FEDFrame(pd.DataFrame):
     '''The main object interface for FED3 data in the fed3 library.  Provides
@@ -77,6 +102,9 @@ class FEDFrame(pd.DataFrame):
     _metadata = ['name', 'path', 'foreign_columns', 'missing_columns',
                  '_alignment', '_current_offset']
 
+    # not in _metadata, so it is never passed on to derived FEDFrames
+    _bounds_cache = None
+
     LR_POKE_METHOD_OPTIONS = ('from_columns', 'from_events')
     LR_POKE_METHOD = 'from_columns'
     L_POKE_EVENTS = ['Left', 'LeftShort', 'LeftWithPellet', 'LeftinTimeout', 'LeftDuringDispense']
@@ -98,7 +126,7 @@ class FEDFrame(pd.DataFrame):
     @property
     def end_time(self):
         """Last timestamp in file."""
-        return pd.Timestamp(self.index.values[-1])
+        return self._time_bounds()[1]
 
     @property
     def events(self):
@@ -113,50 +141,56 @@ class FEDFrame(pd.DataFrame):
     @property
     def start_time(self):
         '''First timestamp in file.'''
-        return pd.Timestamp(self.index.values[0])
+        return self._time_bounds()[0]
 
     # ---- "Private"
 
+    def _active_poke_codes(self):
+        '''Encode the Active_Poke column as an int8 array: 0 for "Left",
+        1 for "Right", and -1 for anything else.'''
+        categories = ['Left', 'Right']
+        return pd.Categorical(self['Active_Poke'], categories=categories).codes
+
     def _binary_correct_pokes(self):
-        l = self._binary_pokes('left')
-        r = self._binary_pokes('right')
-        active_l = self['Active_Poke'] == 'Left'
-        active_r = self['Active_Poke'] == 'Right'
-        correct = ((l * active_l).astype(int) | (r * active_r).astype(int))
+        active = self._active_poke_codes()
+        l = self._decode_events('left')
+        r = self._decode_events('right')
+        correct = np.where(active == 0, l, 0) + np.where(active == 1, r, 0)
 
-        return correct
+        return self._binary_series(correct)
 
     def _binary_error_pokes(self):
-        l = self._binary_pokes('left')
-        r = self._binary_pokes('right')
-        active_l = self['Active_Poke'] == 'Left'
-        active_r = self['Active_Poke'] == 'Right'
-        error = ((l * active_r).astype(int) | (r * active_l).astype(int))
-
-        return error
+        active = self._active_poke_codes()
+        l = self._decode_events('left')
+        r = self._decode_events('right')
+        error = np.where(active == 1, l, 0) + np.where(active == 0, r, 0)
+
+        return self._binary_series(error)
+
+    def _binary_events(self, flags):
+        '''Return a Series counting the events in `flags` (see `EVENT_FLAGS`)
+        logged at each row.  Only those events are decoded.'''
+        counts = np.zeros(len(self), dtype=int)
+        for kind, flag in EVENT_FLAGS.items():
+            if flags & flag:
+                counts += self._decode_events(kind)
+        return self._binary_series(counts)
+
+    def _binary_from_cumulative(self, col, first):
+        '''Return an int array with the increase of the cumulative column
+        `col` at each row, so that a jump of two counts as two events.
+        Decreases (e.g. counter resets) count as zero.  `first` is used
+        for the first row.'''
+        values = self[col].to_numpy()
+        if not len(values):
+            return np.zeros(0, dtype=int)
+
+        # prepending (values[0] - first) makes the first diff equal `first`
+        return np.diff(values, prepend=values[0] - int(first)).clip(min=0)
 
     def _binary_pellets(self):
-        bp = self['Pellet_Count'].diff().copy()
-        if not bp.empty:
-            bp.iloc[0] = int(self._first_event_type() == 'pellet')
-
-        return bp
-
-    def _binary_poke_for_side(self, side):
-        if self.LR_POKE_METHOD == 'from_columns':
-            col = {'left': 'Left_Poke_Count', 'right': 'Right_Poke_Count'}[side]
-            bp = self[col].diff().copy()
-            if not bp.empty:
-                bp.iloc[0] = int(self._first_event_type() == side)
-        elif self.LR_POKE_METHOD == 'from_events':
-            search = {'left': self.L_POKE_EVENTS, 'right': self.R_POKE_EVENTS}[side]
-            bp = self['Event'].isin(search).astype(int)
-        else:
-            raise ValueError(f'"{self.LR_POKE_METHOD}" is not recognized for '
-                             f'FEDFrame.LR_POKE_METHOD.  Should be one of '
-                             f'{FEDFrame.LR_POKE_METHOD_OPTIONS}.')
-
-        return bp
+        # float, as for the differenced pellet counts
+        return self._binary_series(self._decode_events('pellet'), dtype='float64')
 
     def _binary_pokes(self, kind='any'):
         kind = kind.lower()
@@ -165,18 +199,22 @@ class FEDFrame(pd.DataFrame):
             raise ValueError(f'`kind` must be one of  {kinds}, not {kind}')
 
         if kind == 'any':
-            l = self._binary_poke_for_side('left')
-            r = self._binary_poke_for_side('right')
-            bp = ((l == 1) | (r==1)).astype(int)
+            bp = self._binary_events(EVENT_FLAGS['left'] | EVENT_FLAGS['right'])
 
         elif kind in ['left', 'right']:
-            bp = self._binary_poke_for_side(kind).astype(int)
+            bp = self._binary_events(EVENT_FLAGS[kind])
 
         elif kind in ['correct', 'error']:
             bp = self._binary_correct_pokes() if kind == 'correct' else self._binary_error_pokes()
 
         return bp
 
+    def _binary_series(self, binary, dtype=int):
+        '''Wrap an array of per-row event counts as a Series which, like
+        the columns it replaces, takes its name from the FEDFrame.'''
+        y = self._constructor_sliced(binary.astype(dtype), index=self.index)
+        return y.__finalize__(self)
+
     def _cumulative_poke_for_side(self, side):
         if self.LR_POKE_METHOD == 'from_columns':
             col = {'left': 'Left_Poke_Count', 'right': 'Right_Poke_Count'}[side]
@@ -211,15 +249,51 @@ class FEDFrame(pd.DataFrame):
 
         return cp
 
+    def _decode_events(self, kind):
+        '''
+        Return an int array with the number of `kind` events ("pellet",
+        "left", or "right") logged at each row.  Only the source of that one
+        event type is read: its cumulative count column, or the Event
+        column for pokes with the "from_events" `LR_POKE_METHOD`.
+        '''
+        if kind == 'pellet' or self.LR_POKE_METHOD == 'from_columns':
+            col = {'pellet': 'Pellet_Count',
+                   'left': 'Left_Poke_Count',
+                   'right': 'Right_Poke_Count'}[kind]
+            # (the first event type needs a row, but empty frames have no events)
+            first = self._first_event_type() if len(self) else None
+            return self._binary_from_cumulative(col, first == kind)
+
+        elif self.LR_POKE_METHOD == 'from_events':
+            search = {'left': self.L_POKE_EVENTS, 'right': self.R_POKE_EVENTS}[kind]
+            return self['Event'].isin(search).to_numpy().astype(int)
+
+        else:
+            raise ValueError(f'"{self.LR_POKE_METHOD}" is not recognized for '
+                             f'FEDFrame.LR_POKE_METHOD.  Should be one of '
+                             f'{FEDFrame.LR_POKE_METHOD_OPTIONS}.')
+
+    def _event_codes(self, flags=sum(EVENT_FLAGS.values())):
+        '''
+        Decode the events of each row into one int8 array of bit flags (see
+        `EVENT_FLAGS`).  Only the events in `flags` (by default, all of them)
+        are decoded.
+        '''
+        codes = np.zeros(len(self), dtype=np.int8)
+        for kind, flag in EVENT_FLAGS.items():
+            if flags & flag:
+                codes[self._decode_events(kind) > 0] |= flag
+
+        return codes
+
     def _first_event_type(self):
         '''
         Get the type of event for the first entry.  Special case implementation
         of `event_type()`.  Returns either "pellet", "left", "right", or "unknown".
         '''
-        ts = self.index[0]
-        left = self.loc[ts, 'Left_Poke_Count'] == 1
-        right = self.loc[ts, 'Right_Poke_Count'] == 1
-        pellet = self.loc[ts, 'Pellet_Count'] == 1
+        left = self['Left_Poke_Count'].iloc[0] == 1
+        right = self['Right_Poke_Count'].iloc[0] == 1
+        pellet = self['Pellet_Count'].iloc[0] == 1
 
         if sum([left, right, pellet]) != 1:
             return 'unknown'
@@ -238,13 +312,17 @@ class FEDFrame(pd.DataFrame):
 
         '''
         self.foreign_columns = []
+        renames = {}
         for col in self.columns:
-            for fix in FIXED_COLS:
-                likeness = SequenceMatcher(a=col, b=fix).ratio()
-                if likeness > 0.85:
-                    self.rename(columns={col:fix}, inplace=True)
-                    break
+            if col in FIXED_COLS_SET:
+                continue
+            fix = _match_fixed_column(col)
+            if fix is None:
                 self.foreign_columns.append(col)
+            else:
+                renames[col] = fix
+        if renames:
+            self.rename(columns=renames, inplace=True)
         self.missing_columns = [col for col in NEEDED_COLS if
                                 col not in self.columns]
 
@@ -309,6 +387,18 @@ class FEDFrame(pd.DataFrame):
                           "fed3 operations.  Use the deuplicate_index() method "
                           "to remove duplicate timestamps.", RuntimeWarning)
 
+    def _time_bounds(self):
+        '''Return the first and last timestamps.  These are cached against
+        the current index object, which pandas replaces (rather than mutates)
+        whenever the index changes.'''
+        cache = self._bounds_cache
+        if cache is None or cache[0] is not self.index:
+            first, last = self.index.values[[0, -1]]
+            cache = (self.index, pd.Timestamp(first), pd.Timestamp(last))
+            self._bounds_cache = cache
+
+        return cache[1:]
+
     # ---- Public
 
     def check_duplicated_index(self):
@@ -360,8 +450,9 @@ class FEDFrame(pd.DataFrame):
             set (default)
             - `'keep_last'`: keep only the last instance of each duplicate set
             - `'remove'`: delete any rows with duplicate timestamps
-            - `'offset'`: add a small time offset to each date - does so
-            iteratively until the index is not duplicated.
+            - `'offset'`: add a small time offset to each duplicated date
+            (`n` offsets for the `n`th repeat), repeating until the index
+            is not duplicated.
             - `'interpolate'`: offset duplicates such that they are spaced
             evenly between their value and the next timestamp in the series
 
@@ -395,19 +486,22 @@ class FEDFrame(pd.DataFrame):
 
         if method == 'keep_first':
             mask = ~ self.index.duplicated(keep='first')
-            self.query('@mask', inplace=True)
+            self._update_inplace(self[mask])
         elif method == 'keep_last':
             mask = ~ self.index.duplicated(keep='last')
-            self.query('@mask', inplace=True)
+            self._update_inplace(self[mask])
         elif method == 'remove':
             mask = ~ self.index.duplicated(keep=False)
-            self.query('@mask', inplace=True)
+            self._update_inplace(self[mask])
         elif method == 'offset':
             dt = pd.to_timedelta(offset)
+            # shift the nth repeat of each timestamp by n offsets in one
+            # pass; only collisions created by the shift need iterating
+            repeats = self.groupby(level=0, sort=False).cumcount().to_numpy()
+            self.index = self.index + repeats * dt
             while self.check_duplicated_index():
-                self.index = np.where(self.index.duplicated(),
-                                      self.index + dt,
-                                      self.index)
+                self.index = self.index.where(~self.index.duplicated(),
+                                              self.index + dt)
         elif method == 'interpolate':
             if self.index.duplicated()[-1]:
                 raise ValueError("Cannot interpolate when the last "
@@ -441,15 +535,16 @@ class FEDFrame(pd.DataFrame):
             if col in self.columns:
                 column = self[col]
         if not column.empty:
-            if all(isinstance(i,int) for i in column):
-                if len(set(column)) == 1:
-                    mode = 'FR' + str(column[0])
+            first = column.iloc[0]
+            if pd.api.types.is_integer_dtype(column.dtype):
+                if column.nunique() == 1:
+                    mode = 'FR' + str(first)
                 else:
                     mode = 'PR'
-            elif 'PR' in column[0]:
+            elif 'PR' in first:
                 mode = 'PR'
             else:
-                mode = str(column[0])
+                mode = str(first)
         return mode
 
     def event_type(self, timestamp):
@@ -506,26 +601,30 @@ class FEDFrame(pd.DataFrame):
             Pandas Series containing the interpellet intervals.
 
         '''
-        bp = self._binary_pellets()
-        bp = bp[bp == 1]
-        diff = bp.index.to_series().diff().dt.total_seconds() / 60
+        bp = self._binary_pellets().to_numpy()
+        pellets = np.flatnonzero(bp == 1)
+        times = self.index.values.astype('datetime64[ns]').view('i8')
 
-        interpellet = pd.Series(np.nan, index = self.index)
-        interpellet.loc[diff.index] = diff
+        # IPIs of every pellet after the first (nanoseconds to minutes)
+        valid = pellets[1:]
+        ipis = np.diff(times[pellets]) / 6e10
 
         if check_concat and 'Concat_#' in self.columns:
-            #this can't do duplicate indexes
-            if not any(self.index.duplicated()):
-                #thanks to this answer https://stackoverflow.com/a/47115490/13386979
-                dropped = interpellet.dropna()
-                pos = dropped.index.to_series().groupby(self['Concat_#']).first()
-                interpellet.loc[pos[1:]] = np.nan
+            # the first IPI within each concatenated file (besides the
+            # first file) spans the gap between files
+            concat_num = self['Concat_#'].to_numpy()[valid]
+            _, first = np.unique(concat_num, return_index=True)
+            ipis[first[1:]] = np.nan
 
         if condense:
-            interpellet = interpellet.loc[bp.index]
-            interpellet = _filterout(interpellet, dropna=True)
+            # only pellet rows are returned, so skip the full-length array
+            interpellet = pd.Series(ipis, index=self.index[valid])
+            return _filterout(interpellet, dropna=True)
+
+        interpellet = np.full(len(self), np.nan)
+        interpellet[valid] = ipis
 
-        return interpellet
+        return pd.Series(interpellet, index=self.index)
 
     def meals(self, pellet_minimum=1, intermeal_interval=1, condense=False):
         '''
@@ -556,11 +655,12 @@ class FEDFrame(pd.DataFrame):
 
         '''
         ipi = self.interpellet_intervals(condense=True)
-        within_interval = ipi < intermeal_interval
-        meals = ((~within_interval).cumsum() + 1)
-        above_min = meals.value_counts().sort_index() >= pellet_minimum
-        replacements = above_min[above_min].cumsum().reindex(above_min.index)
-        meals = meals.map(replacements)
+        within_interval = ipi.to_numpy() < intermeal_interval
+        raw = np.cumsum(~within_interval)
+        sizes = np.bincount(raw)
+        above_min = (sizes >= pellet_minimum) & (sizes > 0)
+        labels = np.cumsum(above_min)[raw]
+        meals = pd.Series(labels, index=ipi.index).where(above_min[raw])
         if not condense:
             meals = meals.reindex(self.index)
         return meals
@@ -573,7 +673,8 @@ class FEDFrame(pd.DataFrame):
         ----------
         cumulative : bool, optional
             When True (default), the values returned are a cumulative pellet count.
-            When False, the values are binary.
+            When False, the values are the number of pellets at each row
+            (normally 0 or 1), so that they sum to the cumulative count.
         condense : bool, optional
             Return only rows corresponding to pellets.
             The default is False.  When False, the returned Series will
@@ -608,7 +709,8 @@ class FEDFrame(pd.DataFrame):
             and 'error'.
         cumulative : bool, optional
             When True (default), the values returned are a cumulative poke count.
-            When False, the values are binary.
+            When False, the values are the number of pokes at each row
+            (normally 0 or 1), so that they sum to the cumulative count.
         condense : bool, optional
             Return only rows corresponding to poke events.
             The default is False.  When False, the returned Series will
@@ -658,13 +760,18 @@ class FEDFrame(pd.DataFrame):
         None.
 
         '''
+        flags = sum(EVENT_FLAGS.values()) if include_side else EVENT_FLAGS['pellet']
+        codes = self._event_codes(flags)
         if include_side:
-            events = pd.Series(np.nan, index=self.index)
-            events.loc[self._binary_pellets().astype(bool)] = 'Pellet'
-            events.loc[self._binary_pokes('left').astype(bool)] = 'Left'
-            events.loc[self._binary_pokes('right').astype(bool)] = 'Right'
+            # label every possible code, letting Right > Left > Pellet
+            # when several events share a row
+            possible = np.arange(sum(EVENT_FLAGS.values()) + 1)
+            labels = np.full(len(possible), np.nan, dtype=object)
+            for kind in ['pellet', 'left', 'right']:
+                labels[(possible & EVENT_FLAGS[kind]) > 0] = kind.capitalize()
+            events = labels[codes]
         else:
-            events = np.where(self._binary_pellets(), 'Pellet', 'Poke')
+            events = np.where(codes & EVENT_FLAGS['pellet'], 'Pellet', 'Poke')
         self['Event'] = events
 
     def reset_cumulative_column(self, column):
@@ -18,12 +18,38 @@ from collections.abc import Iterable
 import os
 import warnings
 
+import numpy as np
 import pandas as pd
 
 from fed3.core import FEDFrame
 
 '''Date to use when aligning data based on elapsed time or time of day.'''
 
+TIMESTAMP_FORMATS = ['%m/%d/%Y %H:%M:%S',
+                     '%Y-%m-%d %H:%M:%S',
+                     '%m/%d/%Y %H:%M']
+'''Timestamp layouts tried (in order) when parsing the index of loaded data,
+before falling back to generic date parsing.'''
+
+def _parse_timestamps(index):
+    '''Helper function for converting the index of loaded data to datetimes.
+    Known layouts are parsed with an explicit format, which is much faster
+    than inferring each value.  An index which cannot be parsed at all is
+    returned unchanged.'''
+    if index.dtype != object:
+        return index
+
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return pd.to_datetime(index, format=fmt)
+        except (ValueError, TypeError):
+            continue
+
+    try:
+        return pd.to_datetime(index)
+    except (ValueError, TypeError, OverflowError):
+        return index
+
 def _split_handle_dates(dates):
     '''Helper function for parsing the `dates` parameter within `split().'''
     old = pd.Timestamp('01-01-1970')
@@ -79,14 +105,16 @@ def can_concat(feds):
     bool
 
     """
-    sorted_feds = sorted(feds, key=lambda x: x.start_time)
-    for i, file in enumerate(sorted_feds[1:], start=1):
-        if file.start_time <= sorted_feds[i-1].end_time:
-            return False
-    return True
+    feds = list(feds)
+    starts = np.fromiter((f.index.values[0] for f in feds), dtype='datetime64[ns]')
+    ends = np.fromiter((f.index.values[-1] for f in feds), dtype='datetime64[ns]')
+    order = starts.argsort(kind='stable')
+    overlap = starts[order][1:] <= ends[order][:-1]
+    return not overlap.any()
 
 def concat(feds, name=None, add_concat_number=True,
-           reset_columns=('Pellet_Count', 'Left_Poke_Count','Right_Poke_Count')):
+           reset_columns=('Pellet_Count', 'Left_Poke_Count','Right_Poke_Count'),
+           copy=True):
     '''
     Concatenated FED3 data in time.
 
@@ -104,6 +132,12 @@ def concat(feds, name=None, add_concat_number=True,
         Columns whose counts should be modified in order to preserve counts
         across the concatenated data.  The default is
         `('Pellet_Count', 'Left_Poke_Count','Right_Poke_Count')`.
+    copy : bool, optional
+        Copy each FEDFrame before adjusting its counts for concatenation.
+        The default is True.  When False, the input FEDFrames are modified
+        in place (their `reset_columns` are offset, and `'Concat_#'` is
+        added), which saves one full copy per input.  Only use this
+        when the inputs are not needed afterwards.
 
     Raises
     ------
@@ -129,7 +163,7 @@ def concat(feds, name=None, add_concat_number=True,
     sorted_feds = sorted(feds, key=lambda x: x.start_time)
 
     for i, fed in enumerate(sorted_feds):
-        df = fed.copy()
+        df = fed.copy() if copy else fed
         if add_concat_number:
             df['Concat_#'] = i
 
@@ -145,7 +179,7 @@ def concat(feds, name=None, add_concat_number=True,
 
         output.append(df)
 
-    newfed = pd.concat(output)
+    newfed = pd.concat(output, copy=False)
     newfed._load_init(name=name)
 
     return newfed
@@ -202,9 +236,8 @@ def load(path, index_col='MM:DD:YYYY hh:mm:ss', dropna=True,
 
     read_opts = {'.csv':pd.read_csv, '.xlsx':pd.read_excel}
     func = read_opts[ext]
-    feddata = func(path,
-                   parse_dates=True,
-                   index_col=index_col)
+    feddata = func(path, index_col=index_col)
+    feddata.index = _parse_timestamps(feddata.index)
     if dropna:
         feddata = feddata.dropna(how='all')
 
@@ -291,11 +324,18 @@ def split(fed, dates, reset_columns=('Pellet_Count', 'Left_Poke_Count', 'Right_P
     output = []
     offsets = {col: 0 for col in reset_columns}
     og_name = fed.name
-    for i in range(len(dates[:-1])):
-        start = dates[i]
-        end = dates[i+1]
-        subset = fed[(fed.index >= start) &
-                     (fed.index < end)].copy()
+
+    # with a sorted index, each split is a contiguous slice
+    if fed.index.is_monotonic_increasing:
+        times = fed.index.values
+        cuts = np.searchsorted(times, np.array(dates, dtype=times.dtype))
+        selections = [slice(a, b) for a, b in zip(cuts[:-1], cuts[1:])]
+    else:
+        selections = [(fed.index >= start) & (fed.index < end)
+                      for start, end in zip(dates[:-1], dates[1:])]
+
+    for i, rows in enumerate(selections):
+        subset = fed.iloc[rows].copy()
         if tag_name:
             subset.name = f"{og_name}_{i}"
         if not return_empty and subset.empty:
@@ -335,12 +375,13 @@ def timecrop(fed, start, end,
 
     '''
 
-    prior = fed[(fed.index < start)]
-    newfed = fed[(fed.index >= start) &
-                 (fed.index < end)].copy()
-    for col in reset_columns:
-        if not prior.empty:
-            newfed[col] -= prior[col].max()
+    # only the maxima of the reset columns are needed from the rows
+    # before `start`, so those rows are not copied out as a frame
+    prior = fed.index < start
+    newfed = fed[~prior & (fed.index < end)].copy()
+    if prior.any():
+        for col in reset_columns:
+            newfed[col] -= fed[col][prior].max()
 
     if name is not None:
         newfed.name = name
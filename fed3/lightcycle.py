@@ -98,42 +98,26 @@ def lightcycle_tuples(start_date, end_date, lights_on, lights_off, kind='nights'
         start_date = pd.to_datetime(start_date)
         end_date = pd.to_datetime(end_date)
 
-    result = []
-    t = start_date
-    day = pd.Timedelta('24H')
-
-    lookfor = 'on' if kind == 'days' else 'off'
-
-    while True:
-
-        if t == end_date:
-            if lookfor == 'on' and is_at_night(end_date, lights_on, lights_off):
-                result.append(t)
-            break
-
-        elif lookfor == 'off':
-            if is_at_night(t, lights_on, lights_off):
-                result.append(t)
-                new_t = t.replace(hour=lights_on.hour, minute=lights_on.minute).floor('1T')
-                lookfor = 'on'
-            else:
-                new_t = t.replace(hour=lights_off.hour, minute=lights_off.minute).floor('1T')
-
-        elif lookfor == 'on':
-            if not is_at_night(t, lights_on, lights_off):
-                result.append(t)
-                new_t = t.replace(hour=lights_off.hour, minute=lights_off.minute).floor('1T')
-                lookfor = 'off'
-            else:
-                new_t = t.replace(hour=lights_on.hour, minute=lights_on.minute).floor('1T')
-
-        if new_t < t:
-            new_t += day
-
-        if new_t > end_date:
-            new_t = end_date
-
-        t = new_t
+    if start_date == end_date:
+        return []
+
+    # candidate boundaries: every lights on/off time on each calendar day
+    # spanned, kept only if strictly inside the requested window
+    on = pd.Timedelta(hours=lights_on.hour, minutes=lights_on.minute)
+    off = pd.Timedelta(hours=lights_off.hour, minutes=lights_off.minute)
+    days = pd.date_range(pd.Timestamp(start_date).normalize(),
+                         pd.Timestamp(end_date).normalize(), freq='D')
+    bounds = (days + on).append(days + off) if on != off else days[:0]
+    bounds = bounds[(bounds > start_date) & (bounds < end_date)].sort_values()
+
+    start_night = is_at_night(start_date, lights_on, lights_off)
+    result = [start_date] if start_night == (kind == 'nights') else []
+    result += list(bounds)
+
+    # close a night still open at the end of the window
+    if (kind == 'nights' and len(result) % 2 and
+        is_at_night(end_date, lights_on, lights_off)):
+        result.append(end_date)
 
     result = list(zip(result[::2], result[1::2]))
 
@@ -25,6 +25,7 @@ __pdoc__ = {'Metric': False,
 from collections import namedtuple
 import warnings
 
+import numpy as np
 import pandas as pd
 
 # ---- General helpers
@@ -46,17 +47,28 @@ def _default_metric(fed, func, bins=None, origin='start',
 def _filterout(series, dropna=False, dropzero=False, deduplicate=False):
     '''Helper for cleaning up some metrics.'''
 
+    # one combined mask, so the series is only sliced once
+    keep = np.ones(len(series), dtype=bool)
     if dropna:
-        series = series.dropna()
+        keep &= series.notna().to_numpy()
     if dropzero:
-        series = series[series != 0]
+        keep &= (series != 0).to_numpy()
     if deduplicate:
-        series = series[~series.duplicated()]
+        keep &= ~series.duplicated().to_numpy()
 
-    return series
+    return series[keep]
 
 # ---- Helpers for computing metrics
 
+def _running_total_at(series, index):
+    '''Look up the value of a running total (with a sorted, unique index)
+    as of each timestamp in `index`, or 0 before its first entry.  This
+    matches reindexing, forward filling, and filling zeros, without the
+    intermediate float/NaN series.'''
+    pos = np.searchsorted(series.index.values, index.values, side='right')
+    values = np.concatenate([[0], series.to_numpy()])[pos]
+    return pd.Series(values, index=index, name=series.name)
+
 def _cumulative_poke_percentage_general(fed, kind):
     '''General function which is used to compute either the cumulative
     left, right, correct, or error poke percentage.'''
@@ -80,22 +92,27 @@ def _cumulative_poke_percentage_general(fed, kind):
 
     idx = a.index.union(b.index)
 
-    try:
-        a = a.reindex(idx)
-        b = b.reindex(idx)
-    except ValueError:
-        warnings.warn("Unable to reindex two poke arrays, likely "
-                      "due to duplicate index.  Using pandas `duplicated()` "
-                      "to remove duplicate indices.",
-                      RuntimeWarning)
-
-        a = a.loc[~ a.index.duplicated()]
-        b = b.loc[~ b.index.duplicated()]
-        a = a.reindex(idx)
-        b = b.reindex(idx)
-
-    a = a.ffill().fillna(0)
-    b = b.ffill().fillna(0)
+    if all(s.index.is_unique and s.index.is_monotonic_increasing for s in (a, b)):
+        a = _running_total_at(a, idx)
+        b = _running_total_at(b, idx)
+    else:
+        try:
+            a = a.reindex(idx)
+            b = b.reindex(idx)
+        except ValueError:
+            warnings.warn("Unable to reindex two poke arrays, likely "
+                          "due to duplicate index.  Using pandas `duplicated()` "
+                          "to remove duplicate indices.",
+                          RuntimeWarning)
+
+            a = a.loc[~ a.index.duplicated()]
+            b = b.loc[~ b.index.duplicated()]
+            a = a.reindex(idx)
+            b = b.reindex(idx)
+
+        a = a.ffill().fillna(0)
+        b = b.ffill().fillna(0)
+
     total = a + b
 
     return (a / total) * 100
@@ -287,8 +304,8 @@ def motor_turns(fed, bins=None, origin='start'):
     '''Returns the number of motor turns for each pellet dispensal.
     When binned, returns the mean within each bin.'''
     def func(fed):
-        pellets = fed.pellets(cumulative=False).astype(bool)
-        y = fed.loc[pellets, 'Motor_Turns']
+        pellets = fed.pellets(cumulative=False).to_numpy(dtype=bool)
+        y = fed['Motor_Turns'][pellets]
         return y
     agg = 'mean'
     return _default_metric(fed=fed, func=func, bins=bins, origin=origin, agg=agg)
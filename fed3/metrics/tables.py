@@ -73,10 +73,17 @@ def _create_chronogram_df(feds_list, metric, bins='1H', origin_lightcycle=True,
         origin = 'start_day'
 
     metric_df = _create_metric_df(feds_list, metric=metric, bins=bins, origin=origin)
-    bytime = metric_df.groupby(metric_df.index.time).mean()
+
+    # group on the time of day as integer nanoseconds, which sorts the
+    # same as (but is much cheaper than) Python time objects
+    time_of_day = (metric_df.index - metric_df.index.normalize()).asi8
+    bytime = metric_df.groupby(time_of_day).mean()
 
     # handle reindexing things
-    float_index = np.array([x.hour + x.minute / 60 for x in bytime.index.values])
+    minutes = bytime.index.values // (60 * 10**9)
+    float_index = minutes // 60 + (minutes % 60) / 60
+    if not relative_index:
+        bytime.index = pd.to_datetime(bytime.index.values).time
 
     # orders so that the start of the light cycle is first
     if reorder_index:
@@ -94,14 +101,17 @@ def _create_chronogram_df(feds_list, metric, bins='1H', origin_lightcycle=True,
 
 def _create_group_chronogram_df(feds_dict, metric, agg='mean', var='std', bins='1H',
                                 omit_na=False, origin_lightcycle=True,
-                                reorder_index=True, relative_index=True):
-    all_agg = pd.DataFrame()
-    all_var = pd.DataFrame()
+                                reorder_index=True, relative_index=True,
+                                return_tables=False):
+    aggs = []
+    variations = []
+    group_tables = {}
     for group, fedlist in feds_dict.items():
         metric_df = _create_chronogram_df(fedlist, metric=metric, bins=bins,
                                           origin_lightcycle=origin_lightcycle,
                                           reorder_index=reorder_index,
                                           relative_index=relative_index)
+        group_tables[group] = metric_df
         if omit_na:
             metric_df = metric_df.dropna()
 
@@ -114,18 +124,28 @@ def _create_group_chronogram_df(feds_dict, metric, agg='mean', var='std', bins='
             group_var = metric_df.agg(var, axis=1)
         group_var.name = group
 
-        all_agg = all_agg.join(group_agg, how='outer')
-        all_var = all_var.join(group_var, how='outer')
+        aggs.append(group_agg)
+        variations.append(group_var)
+
+    all_agg = _outer_join(aggs)
+    all_var = _outer_join(variations)
+
+    # the per-group tables can be reused (e.g. for plotting raw data),
+    # rather than being computed again
+    if return_tables:
+        return all_agg, all_var, group_tables
 
     return all_agg, all_var
 
 
 def _create_group_metric_df(feds_dict, metric, agg='mean', var='std', bins='1H',
-                            origin='start', omit_na=False):
-    all_agg = pd.DataFrame()
-    all_var = pd.DataFrame()
+                            origin='start', omit_na=False, return_tables=False):
+    aggs = []
+    variations = []
+    group_tables = {}
     for group, fedlist in feds_dict.items():
         metric_df = _create_metric_df(fedlist, metric=metric, bins=bins, origin=origin)
+        group_tables[group] = metric_df
         if omit_na:
             metric_df = metric_df.dropna()
 
@@ -138,16 +158,42 @@ def _create_group_metric_df(feds_dict, metric, agg='mean', var='std', bins='1H',
             group_var = metric_df.agg(var, axis=1)
         group_var.name = group
 
-        all_agg = all_agg.join(group_agg, how='outer')
-        all_var = all_var.join(group_var, how='outer')
+        aggs.append(group_agg)
+        variations.append(group_var)
+
+    all_agg = _outer_join(aggs)
+    all_var = _outer_join(variations)
+
+    # the per-group tables can be reused (e.g. for plotting raw data),
+    # rather than being computed again
+    if return_tables:
+        return all_agg, all_var, group_tables
 
     return all_agg, all_var
 
 def _create_metric_df(feds_list, metric, bins=None, origin='start'):
-    df = pd.DataFrame()
+    series = []
     for fed in feds_list:
         y = metric(fed, bins=bins, origin=origin)
         y.name = getattr(fed, '_plot_name', fed.name)
+        series.append(y)
+
+    return _outer_join(series)
+
+def _outer_join(series):
+    '''Outer join a list of named Series into a DataFrame, one column each.
+    A single concat aligns everything at once, rather than re-aligning
+    the growing table on every join; it needs unique labels, though.'''
+    names = [y.name for y in series]
+    if (series and len(set(names)) == len(names) and
+        all(len(y) and y.index.is_unique for y in series)):
+        # as with joining, shared indices keep their order (which may be
+        # deliberately unsorted, e.g. for chronograms); others are sorted
+        same = all(y.index.equals(series[0].index) for y in series[1:])
+        return pd.concat(series, axis=1, join='outer', sort=not same)
+
+    df = pd.DataFrame()
+    for y in series:
         df = df.join(y, how='outer')
 
     return df
@@ -163,8 +209,17 @@ def _stack_group_values(metric_df, feds_dict):
         for fed in feds:
 
             name = getattr(fed, '_plot_name', fed.name)
-            vals = metric_df[name].dropna().to_list()
-            group_vals += vals
+            vals = metric_df[name].dropna().to_numpy()
+            group_vals.append(vals)
+
+        if not group_vals:
+            # groups without FEDs still get an (empty) column
+            group_vals = [np.array([], dtype='float64')]
+
+        group_vals = np.concatenate(group_vals)
+        if not len(group_vals):
+            # as for an empty list, empty groups are float
+            group_vals = group_vals.astype('float64')
 
         series.append(pd.Series(group_vals, name=group))
 
@@ -19,7 +19,7 @@ from fed3.core.fedfuncs import screen_mixed_alignment
 from fed3.lightcycle import LIGHTCYCLE, time_to_float
 
 from fed3.metrics.core import get_metric
-from fed3.metrics.tables import (_create_chronogram_df, _create_group_chronogram_df)
+from fed3.metrics.tables import _create_group_chronogram_df
 
 from fed3.plot import OPTIONS
 from fed3.plot.helpers import (_assign_plot_names,
@@ -54,9 +54,12 @@ def chronogram_circle(feds, y='pellets', bins='1H', agg='mean', var='std',
     metric_obj = get_metric(y)
     metric = metric_obj.func
     metricname = metric_obj.nicename
-    AGGDATA, VARDATA = _create_group_chronogram_df(feds_dict=feds_dict, metric=metric, bins=bins,
-                                                   agg=agg, var=var, origin_lightcycle=True,
-                                                   reorder_index=True, relative_index=True)
+    AGGDATA, VARDATA, GROUPDATA = _create_group_chronogram_df(feds_dict=feds_dict, metric=metric,
+                                                              bins=bins, agg=agg, var=var,
+                                                              origin_lightcycle=True,
+                                                              reorder_index=True,
+                                                              relative_index=True,
+                                                              return_tables=True)
 
     # create return data
     if var is None:
@@ -118,13 +121,7 @@ def chronogram_circle(feds, y='pellets', bins='1H', agg='mean', var='std',
             # plot individual lines
             if var == 'raw':
 
-                group_feds = feds_dict[col]
-                metric_df = _create_chronogram_df(feds_list=group_feds,
-                                                  metric=metric,
-                                                  bins=bins,
-                                                  origin_lightcycle=True,
-                                                  reorder_index=True,
-                                                  relative_index=True)
+                metric_df = GROUPDATA[col]
                 for col in metric_df.columns:
                     y = metric_df[col]
                     y = np.append(y, y[0])
@@ -180,9 +177,12 @@ def chronogram_line(feds, y='pellets', bins='15T', agg='mean', var='std',
     metric_obj = get_metric(y)
     metric = metric_obj.func
     metricname = metric_obj.nicename
-    AGGDATA, VARDATA = _create_group_chronogram_df(feds_dict=feds_dict, metric=metric, bins=bins,
-                                                   agg=agg, var=var, origin_lightcycle=True,
-                                                   reorder_index=True, relative_index=True)
+    AGGDATA, VARDATA, GROUPDATA = _create_group_chronogram_df(feds_dict=feds_dict, metric=metric,
+                                                              bins=bins, agg=agg, var=var,
+                                                              origin_lightcycle=True,
+                                                              reorder_index=True,
+                                                              relative_index=True,
+                                                              return_tables=True)
 
     # create return data
     if var is None:
@@ -236,13 +236,7 @@ def chronogram_line(feds, y='pellets', bins='15T', agg='mean', var='std',
             # plot individual lines
             if var == 'raw':
 
-                group_feds = feds_dict[col]
-                metric_df = _create_chronogram_df(feds_list=group_feds,
-                                                  metric=metric,
-                                                  bins=bins,
-                                                  origin_lightcycle=True,
-                                                  reorder_index=True,
-                                                  relative_index=True)
+                metric_df = GROUPDATA[col]
                 for col in metric_df.columns:
                     y = metric_df[col]
                     x = y.index
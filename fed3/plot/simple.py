@@ -15,7 +15,7 @@ from fed3.core.fedfuncs import screen_mixed_alignment
 
 from fed3.lightcycle import LIGHTCYCLE
 
-from fed3.metrics.tables import (_create_group_metric_df,  _create_metric_df,)
+from fed3.metrics.tables import _create_group_metric_df
 
 from fed3.metrics.core import get_metric
 
@@ -104,13 +104,14 @@ def _simple_plot(feds_dict, kind='line', y='pellets', bins='1H', agg='mean',
     metric_obj = get_metric(y)
     metric = metric_obj.func
     metricname = metric_obj.nicename
-    AGGDATA, VARDATA = _create_group_metric_df(feds_dict=feds_dict,
-                                               metric=metric,
-                                               agg=agg,
-                                               var=var,
-                                               bins=bins,
-                                               origin=origin,
-                                               omit_na=omit_na)
+    AGGDATA, VARDATA, GROUPDATA = _create_group_metric_df(feds_dict=feds_dict,
+                                                          metric=metric,
+                                                          agg=agg,
+                                                          var=var,
+                                                          bins=bins,
+                                                          origin=origin,
+                                                          omit_na=omit_na,
+                                                          return_tables=True)
 
     # create return data
     if var is None or var == 'raw':
@@ -169,11 +170,7 @@ def _simple_plot(feds_dict, kind='line', y='pellets', bins='1H', agg='mean',
             # plot individual lines
             if var == 'raw':
 
-                group_feds = feds_dict[col]
-                metric_df = _create_metric_df(feds_list=group_feds,
-                                              metric=metric,
-                                              bins=bins,
-                                              origin=origin)
+                metric_df = GROUPDATA[col]
 
                 for col in metric_df.columns:
                     plotfunc(ax=ax, data=metric_df[col], **this_error_kwargs)